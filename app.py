@@ -1,11 +1,14 @@
 from flask import Flask, render_template, request, jsonify
 import os
 from scraper import WebsiteScraper
+from score_store import ScoreStore, CRITERIA, normalize_url
+from scrape_queue import PriorityExecutor, LANES, INTERACTIVE, BULK
 import threading
 import time
 import re
 import urllib.parse
-from concurrent.futures import ThreadPoolExecutor, as_completed
+import uuid
+from concurrent.futures import CancelledError, as_completed
 
 app = Flask(__name__)
 
@@ -253,23 +256,90 @@ app.jinja_env.globals.update(
 scraping_results = {}
 scraping_status = {}
 
+# Per-session cancellation state (not JSON-serializable, kept out of scraping_status)
+scraping_sessions = {}
+status_lock = threading.Lock()
+
+# Shared browser pool: single-site checks jump ahead of bulk comparisons
+# Bulk work never occupies the SCRAPE_INTERACTIVE_RESERVED reserved workers; the
+# defaults leave bulk 4 workers so the form's 4-URL comparison runs in one round
+SCRAPE_WORKERS = max(1, int(os.environ.get('SCRAPE_WORKERS', 5)))
+SCRAPE_INTERACTIVE_RESERVED = max(0, min(int(os.environ.get('SCRAPE_INTERACTIVE_RESERVED', 1)),
+                                         SCRAPE_WORKERS - 1))
+scrape_executor = PriorityExecutor(max_workers=SCRAPE_WORKERS,
+                                   reserved_workers=SCRAPE_INTERACTIVE_RESERVED)
+
+# Cancel sessions nobody has polled for this many seconds (0 disables). Browsers
+# throttle timers in long-hidden tabs to about one per minute, so this stays well
+# above 60s; closed tabs are cancelled right away by the pagehide DELETE.
+SESSION_IDLE_TIMEOUT = int(os.environ.get('SESSION_IDLE_TIMEOUT', 180))
+
+# Persistent score history across restarts
+score_store = ScoreStore()
+
+# Criterion name -> extractor used when persisting parsed scores
+SCORE_EXTRACTORS = {
+    'overall': extract_overall_score,
+    'clarity': extract_clarity_score,
+    'visual_design': extract_visual_design_score,
+    'ux': extract_ux_score,
+    'trust': extract_trust_score,
+    'value_prop': extract_value_prop_score,
+    'audience': extract_audience_score,
+    'developer': extract_developer_score,
+    'investor': extract_investor_score,
+}
+
+# ScoreStore.record reads one value per CRITERIA name; a mismatch would silently store NULLs
+if set(SCORE_EXTRACTORS) != set(CRITERIA):
+    raise RuntimeError('SCORE_EXTRACTORS must cover exactly the score_store CRITERIA')
+
+def record_scores(results):
+    """Parse successful results and persist their scores"""
+    recorded_at = time.time()
+    for result in results:
+        if result.get('status') != 'success' or not result.get('content'):
+            continue
+        try:
+            scores = {name: extract(result['content']) for name, extract in SCORE_EXTRACTORS.items()}
+            score_store.record(result['url'], scores, recorded_at)
+        except Exception as e:
+            print(f"Failed to record scores for {result['url']}: {e}")
+
 def validate_url(url):
     """Basic URL validation"""
     if not url.strip():
         return False
     return url.strip().startswith(('http://', 'https://'))
 
+def cancelled_result(url):
+    """Result placeholder for a URL whose scrape was cancelled"""
+    return {
+        'url': url,
+        'status': 'cancelled',
+        'content': '',
+        'error': 'Analysis cancelled'
+    }
+
 def scrape_single_website(url, session_id, index):
     """Scrape a single website - used for parallel processing"""
+    session = scraping_sessions[session_id]
+    if session['cancel_event'].is_set():
+        return cancelled_result(url)
+
+    scraper = WebsiteScraper(headless=True, cancel_event=session['cancel_event'])
+    with status_lock:
+        session['scrapers'].add(scraper)
+        scraping_status[session_id]['current_url'] = url
     try:
         print(f"Starting scrape for {url}")
-        scraper = WebsiteScraper(headless=True)
         result = scraper.scrape_single_url(url)
         
         # Update status
-        with threading.Lock():
-            scraping_status[session_id]['completed'] += 1
-            scraping_status[session_id]['current_url'] = f"Completed {url}"
+        if result['status'] != 'cancelled':
+            with status_lock:
+                scraping_status[session_id]['completed'] += 1
+                scraping_status[session_id]['current_url'] = f"Completed {url}"
         
         print(f"Completed scrape for {url}")
         return result
@@ -281,6 +351,53 @@ def scrape_single_website(url, session_id, index):
             'content': '',
             'error': str(e)
         }
+    finally:
+        with status_lock:
+            session['scrapers'].discard(scraper)
+
+def cancel_session(session_id, reason):
+    """Stop queued URLs and quit in-progress browsers for a session.
+
+    Returns True if the session was processing and is now cancelling.
+    """
+    session = scraping_sessions.get(session_id)
+    if not session:
+        return False
+    with status_lock:
+        # Only a running session may be cancelled; never clobber a final status
+        if scraping_status[session_id]['status'] != 'processing':
+            return False
+        session['cancel_event'].set()
+        scraping_status[session_id]['status'] = 'cancelling'
+        scraping_status[session_id]['current_url'] = 'Cancelling...'
+        scraping_status[session_id]['error'] = reason
+        futures = list(session['futures'])
+        scrapers = list(session['scrapers'])
+    for future in futures:
+        future.cancel()
+    for scraper in scrapers:
+        scraper.cancel()
+    print(f"Cancelling session {session_id}: {reason}")
+    return True
+
+def cancel_idle_sessions(now=None):
+    """Cancel every session that has not been polled within SESSION_IDLE_TIMEOUT"""
+    now = time.time() if now is None else now
+    for session_id, session in list(scraping_sessions.items()):
+        # cancel_session ignores sessions that are no longer processing
+        if now - session['last_seen'] > SESSION_IDLE_TIMEOUT:
+            cancel_session(session_id, f'No status request for {SESSION_IDLE_TIMEOUT}s')
+
+def reap_idle_sessions():
+    """Background loop cancelling sessions no client is polling any more"""
+    while True:
+        time.sleep(5)
+        cancel_idle_sessions()
+
+if SESSION_IDLE_TIMEOUT > 0:
+    reaper = threading.Thread(target=reap_idle_sessions, name='session-reaper')
+    reaper.daemon = True
+    reaper.start()
 
 @app.route('/')
 def index():
@@ -323,19 +440,37 @@ def start_scraping():
             'message': 'Maximum 10 websites allowed per analysis'
         }), 400
     
+    # Single-site checks default to the interactive lane, comparisons to bulk
+    lane = data.get('priority')
+    if lane is None:
+        priority = INTERACTIVE if len(valid_urls) == 1 else BULK
+    elif lane in LANES:
+        priority = LANES[lane]
+    else:
+        return jsonify({
+            'status': 'error',
+            'message': f'Invalid priority: {lane}. Use one of: {", ".join(LANES)}'
+        }), 400
+    
     # Generate a session ID for this scraping task
-    session_id = str(int(time.time()))
+    session_id = uuid.uuid4().hex
     
     # Initialize status
     scraping_status[session_id] = {
         'status': 'processing',
         'completed': 0,
         'total': len(valid_urls),
-        'current_url': 'Starting...'
+        'current_url': 'Queued...'
+    }
+    scraping_sessions[session_id] = {
+        'cancel_event': threading.Event(),
+        'futures': [],
+        'scrapers': set(),
+        'last_seen': time.time()
     }
     
     # Start scraping in background thread with parallel processing
-    thread = threading.Thread(target=perform_parallel_scraping, args=(session_id, valid_urls))
+    thread = threading.Thread(target=perform_parallel_scraping, args=(session_id, valid_urls, priority))
     thread.daemon = True
     thread.start()
     
@@ -345,51 +480,74 @@ def start_scraping():
         'total_urls': len(valid_urls)
     })
 
-def perform_parallel_scraping(session_id, urls):
+def perform_parallel_scraping(session_id, urls, priority=BULK):
     """Perform parallel scraping for faster results"""
+    session = scraping_sessions[session_id]
     try:
         print(f"Starting parallel scraping for {len(urls)} URLs")
         
-        # Use ThreadPoolExecutor for parallel processing
-        with ThreadPoolExecutor(max_workers=min(len(urls), 4)) as executor:
-            # Submit all scraping tasks
-            future_to_url = {
-                executor.submit(scrape_single_website, url, session_id, i): url 
-                for i, url in enumerate(urls)
-            }
-            
-            results = []
-            
-            # Collect results as they complete
-            for future in as_completed(future_to_url):
-                url = future_to_url[future]
-                try:
-                    result = future.result()
-                    results.append(result)
-                    print(f"Got result for {url}")
-                except Exception as e:
-                    print(f"Failed to get result for {url}: {e}")
-                    results.append({
-                        'url': url,
-                        'status': 'error',
-                        'content': '',
-                        'error': str(e)
-                    })
+        # Submit all scraping tasks to the shared browser pool
+        future_to_url = {
+            scrape_executor.submit(priority, scrape_single_website, url, session_id, i): url
+            for i, url in enumerate(urls)
+        }
+        with status_lock:
+            session['futures'] = list(future_to_url)
+        # A cancel that raced with submission has already missed these futures
+        if session['cancel_event'].is_set():
+            for future in future_to_url:
+                future.cancel()
+        
+        results = []
+        
+        # Collect results as they complete
+        for future in as_completed(future_to_url):
+            url = future_to_url[future]
+            try:
+                result = future.result()
+                results.append(result)
+                print(f"Got result for {url}")
+            except CancelledError:
+                results.append(cancelled_result(url))
+            except Exception as e:
+                print(f"Failed to get result for {url}: {e}")
+                results.append({
+                    'url': url,
+                    'status': 'error',
+                    'content': '',
+                    'error': str(e)
+                })
         
         # Sort results by original URL order
         url_order = {url: i for i, url in enumerate(urls)}
         results.sort(key=lambda x: url_order.get(x['url'], 999))
         
         scraping_results[session_id] = results
-        scraping_status[session_id]['status'] = 'completed'
-        scraping_status[session_id]['current_url'] = 'All completed!'
+        record_scores(results)
+        # A cancel that arrives after every URL finished changes nothing
+        cancelled = any(result['status'] == 'cancelled' for result in results)
+        with status_lock:
+            if cancelled:
+                scraping_status[session_id]['status'] = 'cancelled'
+                scraping_status[session_id]['current_url'] = 'Cancelled'
+            else:
+                scraping_status[session_id]['status'] = 'completed'
+                scraping_status[session_id]['current_url'] = 'All completed!'
+                scraping_status[session_id].pop('error', None)
         
-        print("All scraping completed!")
+        if cancelled:
+            print(f"Scraping cancelled for session {session_id}")
+        else:
+            print("All scraping completed!")
         
     except Exception as e:
         print(f"Error in parallel scraping: {e}")
-        scraping_status[session_id]['status'] = 'error'
-        scraping_status[session_id]['error'] = str(e)
+        with status_lock:
+            scraping_status[session_id]['status'] = 'error'
+            scraping_status[session_id]['error'] = str(e)
+    finally:
+        with status_lock:
+            scraping_sessions.pop(session_id, None)
 
 @app.route('/status/<session_id>')
 def get_status(session_id):
@@ -397,6 +555,26 @@ def get_status(session_id):
     if session_id not in scraping_status:
         return jsonify({'status': 'not_found'}), 404
     
+    # The session entry is dropped once scraping finishes
+    session = scraping_sessions.get(session_id)
+    if session:
+        session['last_seen'] = time.time()
+    return jsonify(scraping_status[session_id])
+
+@app.route('/scrape/<session_id>', methods=['DELETE'])
+def cancel_scraping(session_id):
+    """Cancel a running scraping session"""
+    if session_id not in scraping_status:
+        return jsonify({'status': 'not_found'}), 404
+    
+    cancelled = cancel_session(session_id, 'Cancelled by user')
+    status = scraping_status[session_id]['status']
+    if not cancelled and status != 'cancelling':
+        return jsonify({
+            'status': 'error',
+            'message': f"Session already {status}"
+        }), 409
+    
     return jsonify(scraping_status[session_id])
 
 @app.route('/results/<session_id>')
@@ -409,6 +587,61 @@ def get_results(session_id):
                          results=scraping_results[session_id],
                          session_id=session_id)
 
+def parse_limit(default, maximum):
+    """Read the limit query parameter; None if it is not an integer in 1..maximum"""
+    raw = request.args.get('limit')
+    if raw is None:
+        return default
+    try:
+        limit = int(raw)
+    except ValueError:
+        return None
+    return limit if 1 <= limit <= maximum else None
+
+@app.route('/scores/history')
+def get_score_history():
+    """Get a site's most recent stored scores, oldest first"""
+    url = request.args.get('url', '').strip()
+    if not url:
+        return jsonify({
+            'status': 'error',
+            'message': 'Please provide a url query parameter'
+        }), 400
+
+    limit = parse_limit(default=100, maximum=1000)
+    if limit is None:
+        return jsonify({
+            'status': 'error',
+            'message': 'limit must be an integer between 1 and 1000'
+        }), 400
+
+    return jsonify({
+        'url': url,
+        'site': normalize_url(url),
+        'history': score_store.history(url, limit)
+    })
+
+@app.route('/scores/leaderboard/<criterion>')
+def get_leaderboard(criterion):
+    """Get the top-N sites by their latest score for a criterion"""
+    if criterion not in CRITERIA:
+        return jsonify({
+            'status': 'error',
+            'message': f'Unknown criterion: {criterion}. Choose one of: {", ".join(CRITERIA)}'
+        }), 400
+
+    limit = parse_limit(default=10, maximum=100)
+    if limit is None:
+        return jsonify({
+            'status': 'error',
+            'message': 'limit must be an integer between 1 and 100'
+        }), 400
+
+    return jsonify({
+        'criterion': criterion,
+        'leaderboard': score_store.leaderboard(criterion, limit)
+    })
+
 if __name__ == '__main__':
     port = int(os.environ.get('PORT', 5000))
     app.run(host='0.0.0.0', port=port, debug=False)
\ No newline at end of file
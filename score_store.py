@@ -0,0 +1,152 @@
+#!/usr/bin/env python3
+"""
+SQLite-backed history of parsed RateMySite scores
+
+Every analysis is stored as one row of numeric scores so history and
+leaderboard queries are answered from indexes instead of re-parsing text.
+"""
+
+import os
+import sqlite3
+import threading
+import time
+import urllib.parse
+from typing import Optional, List, Dict
+
+DEFAULT_DB_PATH = os.environ.get('SCORE_DB_PATH', 'scores.db')
+
+# Criterion name -> column name. The names are also what the API accepts.
+CRITERIA = (
+    'overall',
+    'clarity',
+    'visual_design',
+    'ux',
+    'trust',
+    'value_prop',
+    'audience',
+    'developer',
+    'investor',
+)
+
+_SCORE_COLUMNS = ', '.join(f'{c} REAL' for c in CRITERIA)
+
+_SCHEMA = f"""
+CREATE TABLE IF NOT EXISTS score_history (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    site TEXT NOT NULL,
+    recorded_at REAL NOT NULL,
+    {_SCORE_COLUMNS}
+);
+CREATE INDEX IF NOT EXISTS idx_history_site_time ON score_history (site, recorded_at);
+
+CREATE TABLE IF NOT EXISTS latest_scores (
+    site TEXT PRIMARY KEY,
+    recorded_at REAL NOT NULL,
+    {_SCORE_COLUMNS}
+);
+""" + '\n'.join(
+    f'CREATE INDEX IF NOT EXISTS idx_latest_{c} ON latest_scores ({c} DESC);'
+    for c in CRITERIA
+)
+
+
+def normalize_url(url: str) -> str:
+    """Reduce a URL to the site key its history is stored under.
+
+    The scheme and a leading ``www.`` are dropped and the host lowercased, so
+    ``http://www.Example.com/`` and ``https://example.com`` share a history.
+    Paths stay case-sensitive.
+    """
+    parsed = urllib.parse.urlsplit(url.strip())
+    host = parsed.hostname or ''
+    if host.startswith('www.'):
+        host = host[4:]
+    try:
+        port = parsed.port
+    except ValueError:
+        port = None
+    if port:
+        host = f'{host}:{port}'
+    site = host + parsed.path.rstrip('/')
+    if parsed.query:
+        site += '?' + parsed.query
+    return site
+
+
+def _to_float(value) -> Optional[float]:
+    """Convert an extracted score string to a float, or None if unparseable"""
+    if value is None or value == '':
+        return None
+    try:
+        return float(value)
+    except (TypeError, ValueError):
+        return None
+
+
+class ScoreStore:
+    def __init__(self, db_path: str = DEFAULT_DB_PATH):
+        self.db_path = db_path
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(db_path, check_same_thread=False)
+        self._conn.row_factory = sqlite3.Row
+        with self._lock:
+            if db_path != ':memory:':
+                self._conn.execute('PRAGMA journal_mode=WAL')
+            self._conn.executescript(_SCHEMA)
+            self._conn.commit()
+
+    def record(self, url: str, scores: Dict[str, Optional[str]],
+               recorded_at: Optional[float] = None) -> None:
+        """Persist one analysis; unknown criteria are ignored"""
+        site = normalize_url(url)
+        recorded_at = time.time() if recorded_at is None else recorded_at
+        values = [_to_float(scores.get(c)) for c in CRITERIA]
+        columns = ', '.join(('site', 'recorded_at') + CRITERIA)
+        placeholders = ', '.join('?' * (len(CRITERIA) + 2))
+        updates = ', '.join(f'{c} = excluded.{c}' for c in ('recorded_at',) + CRITERIA)
+
+        with self._lock:
+            with self._conn:
+                self._conn.execute(
+                    f'INSERT INTO score_history ({columns}) VALUES ({placeholders})',
+                    [site, recorded_at] + values,
+                )
+                # Keep only the newest analysis per site in latest_scores
+                self._conn.execute(
+                    f'INSERT INTO latest_scores ({columns}) VALUES ({placeholders}) '
+                    f'ON CONFLICT(site) DO UPDATE SET {updates} '
+                    f'WHERE excluded.recorded_at >= latest_scores.recorded_at',
+                    [site, recorded_at] + values,
+                )
+
+    def history(self, url: str, limit: Optional[int] = None) -> List[Dict]:
+        """Return a site's scores oldest first (the newest `limit` if given)"""
+        site = normalize_url(url)
+        columns = ', '.join(('recorded_at',) + CRITERIA)
+        with self._lock:
+            if limit is None:
+                rows = self._conn.execute(
+                    f'SELECT {columns} FROM score_history '
+                    f'WHERE site = ? ORDER BY recorded_at',
+                    (site,),
+                ).fetchall()
+            else:
+                rows = self._conn.execute(
+                    f'SELECT {columns} FROM score_history '
+                    f'WHERE site = ? ORDER BY recorded_at DESC LIMIT ?',
+                    (site, limit),
+                ).fetchall()
+                rows.reverse()
+        return [dict(row) for row in rows]
+
+    def leaderboard(self, criterion: str, limit: int = 10) -> List[Dict]:
+        """Return the top sites by their latest score for a criterion"""
+        if criterion not in CRITERIA:
+            raise ValueError(f'Unknown criterion: {criterion}')
+        with self._lock:
+            rows = self._conn.execute(
+                f'SELECT site, recorded_at, {criterion} AS score FROM latest_scores '
+                f'WHERE {criterion} IS NOT NULL ORDER BY {criterion} DESC LIMIT ?',
+                (limit,),
+            ).fetchall()
+        return [dict(row) for row in rows]
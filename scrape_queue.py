@@ -0,0 +1,85 @@
+#!/usr/bin/env python3
+"""
+Shared browser worker pool with interactive and bulk priority lanes
+"""
+
+import threading
+from collections import deque
+from concurrent.futures import Future
+
+INTERACTIVE = 0
+BULK = 1
+
+LANES = {
+    'interactive': INTERACTIVE,
+    'bulk': BULK,
+}
+
+
+class PriorityExecutor:
+    """Fixed pool of worker threads serving an interactive and a bulk lane.
+
+    Queued interactive jobs always start before queued bulk jobs, and
+    `reserved_workers` threads are kept for the interactive lane: bulk jobs
+    may occupy at most `max_workers - reserved_workers` workers at once, so a
+    single-site check starts immediately even while a comparison is running.
+    Within a lane jobs run in submission order. Returned futures can be
+    cancelled while still queued.
+    """
+
+    def __init__(self, max_workers: int = 4, reserved_workers: int = 1):
+        if max_workers < 1:
+            raise ValueError('max_workers must be at least 1')
+        if not 0 <= reserved_workers < max_workers:
+            raise ValueError('reserved_workers must be between 0 and max_workers - 1')
+        self.max_workers = max_workers
+        self.reserved_workers = reserved_workers
+        self._queues = {INTERACTIVE: deque(), BULK: deque()}
+        self._bulk_running = 0
+        self._condition = threading.Condition()
+        self._workers = []
+        for i in range(max_workers):
+            worker = threading.Thread(target=self._work, name=f'scrape-worker-{i}')
+            worker.daemon = True
+            worker.start()
+            self._workers.append(worker)
+
+    def submit(self, priority: int, fn, *args, **kwargs) -> Future:
+        if priority not in self._queues:
+            raise ValueError(f'Unknown priority: {priority}')
+        future = Future()
+        with self._condition:
+            self._queues[priority].append((future, fn, args, kwargs))
+            self._condition.notify()
+        return future
+
+    def _next_job(self):
+        """Pop the next runnable job, or None if nothing may start yet"""
+        if self._queues[INTERACTIVE]:
+            return INTERACTIVE, self._queues[INTERACTIVE].popleft()
+        bulk_limit = self.max_workers - self.reserved_workers
+        if self._queues[BULK] and self._bulk_running < bulk_limit:
+            self._bulk_running += 1
+            return BULK, self._queues[BULK].popleft()
+        return None
+
+    def _work(self):
+        while True:
+            with self._condition:
+                job = self._next_job()
+                while job is None:
+                    self._condition.wait()
+                    job = self._next_job()
+            lane, (future, fn, args, kwargs) = job
+            try:
+                # Skip jobs cancelled while they waited in the queue
+                if future.set_running_or_notify_cancel():
+                    try:
+                        future.set_result(fn(*args, **kwargs))
+                    except BaseException as e:
+                        future.set_exception(e)
+            finally:
+                if lane == BULK:
+                    with self._condition:
+                        self._bulk_running -= 1
+                        self._condition.notify()
@@ -5,6 +5,7 @@ Scraper optimized for Railway deployment with container-specific Chrome settings
 
 import time
 import os
+import threading
 from typing import Optional, List, Dict
 from selenium import webdriver
 from selenium.webdriver.common.by import By
@@ -22,11 +23,46 @@ from selenium.webdriver.support import expected_conditions as EC
 RATEMYSITE_URL = "https://www.ratemysite.xyz/"
 DEFAULT_TIMEOUT = 30  # Reduced timeout for faster response
 
+class ScrapeCancelled(Exception):
+    """Raised inside a scrape when its cancel event has been set"""
+
 class WebsiteScraper:
-    def __init__(self, headless=True, timeout=DEFAULT_TIMEOUT):
+    def __init__(self, headless=True, timeout=DEFAULT_TIMEOUT, cancel_event: Optional[threading.Event] = None):
         self.headless = headless
         self.timeout = timeout
         self.driver = None
+        self.cancel_event = cancel_event
+
+    def is_cancelled(self) -> bool:
+        return self.cancel_event is not None and self.cancel_event.is_set()
+
+    def _sleep(self, seconds: float):
+        """Sleep that wakes up early and raises if the scrape is cancelled"""
+        if self.cancel_event is None:
+            time.sleep(seconds)
+        elif self.cancel_event.wait(seconds):
+            raise ScrapeCancelled()
+
+    def cancel(self):
+        """Abort the browser from another thread without waiting on it.
+
+        ChromeDriver runs one command at a time, so driver.quit() would queue
+        behind an in-flight page load. Stopping the driver service instead
+        shuts down ChromeDriver (and its Chrome), failing the blocked command
+        right away. That runs on a throwaway thread so callers return at once.
+        """
+        driver = self.driver
+        if driver:
+            thread = threading.Thread(target=self._stop_service, args=(driver,))
+            thread.daemon = True
+            thread.start()
+
+    @staticmethod
+    def _stop_service(driver):
+        try:
+            driver.service.stop()
+        except Exception as e:
+            print(f"Failed to stop ChromeDriver service: {e}")
         
     def _setup_driver(self):
         """Setup Chrome driver optimized for Railway container deployment"""
@@ -108,6 +144,9 @@ class WebsiteScraper:
             
         except Exception as e:
             print(f"Failed to initialize Chrome: {e}")
+            # A cancel stops the service mid-setup; don't relaunch Chrome for it
+            if self.is_cancelled():
+                raise ScrapeCancelled()
             # Try with additional fallback options
             try:
                 chrome_opts.add_argument("--crash-dumps-dir=/tmp")
@@ -151,11 +190,13 @@ class WebsiteScraper:
             if btn.is_enabled():
                 try:
                     self.driver.execute_script("arguments[0].scrollIntoView();", btn)
-                    time.sleep(0.5)
+                    self._sleep(0.5)
                     btn.click()
                 except ElementClickInterceptedException:
                     self.driver.execute_script("arguments[0].click();", btn)
                 return True
+        except ScrapeCancelled:
+            raise
         except Exception:
             pass
         return False
@@ -163,7 +204,7 @@ class WebsiteScraper:
     def _collect_result_text(self) -> str:
         """Extract result text from the page"""
         # Wait a bit for content to load
-        time.sleep(2)
+        self._sleep(2)
         
         containers = self.driver.find_elements(
             By.XPATH,
@@ -189,19 +230,39 @@ class WebsiteScraper:
             'error': None
         }
         
+        if self.is_cancelled():
+            result['status'] = 'cancelled'
+            result['error'] = 'Analysis cancelled'
+            return result
+
         try:
             print(f"Setting up browser for {target_url}...")
             wait = self._setup_driver()
         except Exception as e:
+            if self.driver:
+                try:
+                    self.driver.quit()
+                except Exception:
+                    pass
+                self.driver = None
+            if isinstance(e, ScrapeCancelled) or self.is_cancelled():
+                result['status'] = 'cancelled'
+                result['error'] = 'Analysis cancelled'
+                print(f"Cancelled analysis of {target_url}")
+                return result
             result['status'] = 'error'
             result['error'] = f'Failed to initialize browser: {str(e)}'
             print(f"Browser setup failed: {e}")
             return result
         
         try:
+            # Cancellation may have arrived while Chrome was starting
+            if self.is_cancelled():
+                raise ScrapeCancelled()
+
             print(f"Navigating to RateMySite...")
             self.driver.get(RATEMYSITE_URL)
-            time.sleep(2)
+            self._sleep(2)
 
             # Find URL input - simplified approach
             input_el = None
@@ -217,6 +278,9 @@ class WebsiteScraper:
                         pass
 
             if not input_el:
+                # The lookups above swallow the failure a cancel() causes
+                if self.is_cancelled():
+                    raise ScrapeCancelled()
                 result['status'] = 'error'
                 result['error'] = 'Could not locate input field on RateMySite'
                 return result
@@ -224,7 +288,7 @@ class WebsiteScraper:
             print(f"Entering URL: {target_url}")
             input_el.clear()
             input_el.send_keys(target_url)
-            time.sleep(1)
+            self._sleep(1)
 
             print("Submitting for analysis...")
             # Try to submit
@@ -234,7 +298,7 @@ class WebsiteScraper:
 
             print("Waiting for results...")
             # Wait for results with simpler approach
-            time.sleep(15)  # Give more time for analysis
+            self._sleep(15)  # Give more time for analysis
 
             # Extract content
             content = self._collect_result_text()
@@ -242,9 +306,15 @@ class WebsiteScraper:
             print(f"Analysis complete for {target_url}")
             
         except Exception as e:
-            result['status'] = 'error'
-            result['error'] = str(e)
-            print(f"Error analyzing {target_url}: {e}")
+            # Driver calls fail once cancel() has quit the browser
+            if isinstance(e, ScrapeCancelled) or self.is_cancelled():
+                result['status'] = 'cancelled'
+                result['error'] = 'Analysis cancelled'
+                print(f"Cancelled analysis of {target_url}")
+            else:
+                result['status'] = 'error'
+                result['error'] = str(e)
+                print(f"Error analyzing {target_url}: {e}")
             
         finally:
             if self.driver:
@@ -9,6 +9,13 @@ document.addEventListener('DOMContentLoaded', function() {
     initializeForm();
 });
 
+// Free server browsers when the tab is closed mid-analysis
+window.addEventListener('pagehide', function() {
+    if (currentSessionId && statusCheckInterval) {
+        fetch(`/scrape/${currentSessionId}`, { method: 'DELETE', keepalive: true });
+    }
+});
+
 function initializeForm() {
     // Focus on primary URL input
     const primaryInput = document.getElementById('primaryUrl');
@@ -284,6 +291,10 @@ async function checkAnalysisStatus() {
             stopStatusChecking();
             showError(status.error || 'An error occurred during competitive analysis');
             enableForm();
+        } else if (status.status === 'cancelled') {
+            stopStatusChecking();
+            showError(status.error || 'Competitive analysis was cancelled');
+            enableForm();
         }
         
     } catch (error) {
@@ -0,0 +1,7 @@
+import os
+import sys
+
+# Keep the app's score store in memory so importing app never creates scores.db
+os.environ.setdefault('SCORE_DB_PATH', ':memory:')
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
@@ -0,0 +1,162 @@
+import threading
+import time
+
+import pytest
+
+import app as app_module
+import scraper as scraper_module
+from scrape_queue import PriorityExecutor
+from scraper import WebsiteScraper
+
+FINAL_STATUSES = ('completed', 'cancelled', 'error')
+
+
+class FakeScraper:
+    """Stands in for WebsiteScraper: blocks until released or cancelled"""
+
+    release = None
+    created = None
+
+    def __init__(self, headless=True, cancel_event=None):
+        self.cancel_event = cancel_event
+        self.created.append(self)
+
+    def scrape_single_url(self, url):
+        while not self.release.is_set():
+            if self.cancel_event.wait(0.01):
+                return {'url': url, 'status': 'cancelled', 'content': '', 'error': 'Analysis cancelled'}
+        return {'url': url, 'status': 'success', 'content': 'Overall score: 8', 'error': None}
+
+    def cancel(self):
+        pass
+
+
+@pytest.fixture
+def client(monkeypatch):
+    FakeScraper.release = threading.Event()
+    FakeScraper.created = []
+    monkeypatch.setattr(app_module, 'WebsiteScraper', FakeScraper)
+    yield app_module.app.test_client()
+    FakeScraper.release.set()
+
+
+def start(client, *urls):
+    data = {f'url{i}': url for i, url in enumerate(urls, 1)}
+    response = client.post('/scrape', json=data)
+    assert response.status_code == 200
+    return response.get_json()['session_id']
+
+
+def wait_for_final_status(client, session_id):
+    deadline = time.time() + 5
+    while time.time() < deadline:
+        status = client.get(f'/status/{session_id}').get_json()
+        if status['status'] in FINAL_STATUSES:
+            return status
+        time.sleep(0.02)
+    raise AssertionError(f'session {session_id} did not finish')
+
+
+def test_delete_unknown_session_returns_404(client):
+    assert client.delete('/scrape/missing').status_code == 404
+
+
+def test_delete_cancels_running_session(client):
+    session_id = start(client, 'https://a.com')
+
+    response = client.delete(f'/scrape/{session_id}')
+    assert response.status_code == 200
+    assert response.get_json()['status'] in ('cancelling', 'cancelled')
+
+    status = wait_for_final_status(client, session_id)
+    assert status['status'] == 'cancelled'
+    assert app_module.scraping_results[session_id][0]['status'] == 'cancelled'
+    assert session_id not in app_module.scraping_sessions
+
+    assert client.delete(f'/scrape/{session_id}').status_code == 409
+
+
+def test_delete_finished_session_returns_409(client):
+    FakeScraper.release.set()
+    session_id = start(client, 'https://a.com')
+    assert wait_for_final_status(client, session_id)['status'] == 'completed'
+
+    assert client.delete(f'/scrape/{session_id}').status_code == 409
+    assert app_module.scraping_status[session_id]['status'] == 'completed'
+
+
+def test_cancel_skips_queued_urls(client, monkeypatch):
+    monkeypatch.setattr(app_module, 'scrape_executor', PriorityExecutor(max_workers=1, reserved_workers=0))
+    session_id = start(client, 'https://a.com', 'https://b.com', 'https://c.com')
+    while not FakeScraper.created:
+        time.sleep(0.01)
+
+    assert client.delete(f'/scrape/{session_id}').status_code == 200
+    assert wait_for_final_status(client, session_id)['status'] == 'cancelled'
+
+    # Only the running URL ever got a scraper; the queued ones were dropped
+    assert len(FakeScraper.created) == 1
+    results = app_module.scraping_results[session_id]
+    assert [r['url'] for r in results] == ['https://a.com', 'https://b.com', 'https://c.com']
+    assert all(r['status'] == 'cancelled' for r in results)
+
+
+def test_idle_sessions_are_cancelled(client):
+    session_id = start(client, 'https://a.com')
+    app_module.scraping_sessions[session_id]['last_seen'] -= app_module.SESSION_IDLE_TIMEOUT + 1
+
+    app_module.cancel_idle_sessions()
+
+    assert app_module.scraping_status[session_id]['status'] in ('cancelling', 'cancelled')
+    assert wait_for_final_status(client, session_id)['status'] == 'cancelled'
+
+
+def test_polled_sessions_are_not_reaped(client):
+    session_id = start(client, 'https://a.com')
+    client.get(f'/status/{session_id}')
+
+    app_module.cancel_idle_sessions()
+
+    assert app_module.scraping_status[session_id]['status'] == 'processing'
+
+
+def test_cancel_after_all_urls_finished_still_completes(client, monkeypatch):
+    def cancel_while_recording(results):
+        for session_id in list(app_module.scraping_sessions):
+            app_module.cancel_session(session_id, 'late cancel')
+
+    monkeypatch.setattr(app_module, 'record_scores', cancel_while_recording)
+    FakeScraper.release.set()
+    session_id = start(client, 'https://a.com')
+
+    status = wait_for_final_status(client, session_id)
+    assert status['status'] == 'completed'
+    assert 'error' not in status
+
+
+def test_scraper_returns_cancelled_when_event_is_set():
+    event = threading.Event()
+    event.set()
+
+    result = WebsiteScraper(cancel_event=event).scrape_single_url('https://a.com')
+
+    assert result['status'] == 'cancelled'
+
+
+def test_scraper_does_not_relaunch_chrome_after_cancel(monkeypatch):
+    event = threading.Event()
+    launches = []
+
+    def fake_chrome(*args, **kwargs):
+        launches.append(kwargs)
+        # Simulate cancel() stopping ChromeDriver while Chrome starts up
+        event.set()
+        raise RuntimeError('chromedriver stopped')
+
+    monkeypatch.setattr(scraper_module, 'Service', lambda **kwargs: None)
+    monkeypatch.setattr(scraper_module.webdriver, 'Chrome', fake_chrome)
+
+    result = WebsiteScraper(cancel_event=event).scrape_single_url('https://a.com')
+
+    assert result['status'] == 'cancelled'
+    assert len(launches) == 1
@@ -0,0 +1,51 @@
+import pytest
+
+import app as app_module
+
+
+@pytest.fixture
+def client():
+    return app_module.app.test_client()
+
+
+def test_history_requires_url(client):
+    response = client.get('/scores/history')
+    assert response.status_code == 400
+
+
+@pytest.mark.parametrize('limit', ['0', '1001', 'abc'])
+def test_history_rejects_bad_limit(client, limit):
+    response = client.get(f'/scores/history?url=https://example.com&limit={limit}')
+    assert response.status_code == 400
+
+
+def test_history_returns_recorded_scores(client):
+    app_module.score_store.record('https://history-test.com', {'overall': '7'}, recorded_at=1)
+    app_module.score_store.record('https://www.history-test.com/', {'overall': '8'}, recorded_at=2)
+
+    response = client.get('/scores/history?url=http://history-test.com&limit=1')
+    assert response.status_code == 200
+    data = response.get_json()
+    assert data['site'] == 'history-test.com'
+    assert [row['overall'] for row in data['history']] == [8.0]
+
+
+def test_leaderboard_rejects_unknown_criterion(client):
+    response = client.get('/scores/leaderboard/speed')
+    assert response.status_code == 400
+
+
+@pytest.mark.parametrize('limit', ['0', '101', 'abc'])
+def test_leaderboard_rejects_bad_limit(client, limit):
+    response = client.get(f'/scores/leaderboard/overall?limit={limit}')
+    assert response.status_code == 400
+
+
+def test_leaderboard_returns_top_sites(client):
+    app_module.score_store.record('https://leader-a.com', {'investor': '99'}, recorded_at=1)
+    app_module.score_store.record('https://leader-b.com', {'investor': '98'}, recorded_at=1)
+
+    response = client.get('/scores/leaderboard/investor?limit=2')
+    assert response.status_code == 200
+    data = response.get_json()
+    assert [row['site'] for row in data['leaderboard']] == ['leader-a.com', 'leader-b.com']
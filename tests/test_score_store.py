@@ -0,0 +1,54 @@
+from score_store import ScoreStore, normalize_url
+
+
+def make_store():
+    return ScoreStore(':memory:')
+
+
+def test_normalize_url_merges_scheme_and_www_but_keeps_path_case():
+    assert normalize_url('http://www.Example.com/') == 'example.com'
+    assert normalize_url('https://example.com') == 'example.com'
+    assert normalize_url('https://example.com/About/') == 'example.com/About'
+    assert normalize_url('https://example.com/about') != normalize_url('https://example.com/About')
+
+
+def test_record_and_history_order():
+    store = make_store()
+    store.record('https://example.com', {'overall': '7.5', 'clarity': '8'}, recorded_at=1)
+    store.record('http://www.example.com/', {'overall': '8'}, recorded_at=2)
+    store.record('https://example.com', {'overall': '9'}, recorded_at=3)
+    store.record('https://other.com', {'overall': '1'}, recorded_at=4)
+
+    history = store.history('https://example.com')
+    assert [row['recorded_at'] for row in history] == [1, 2, 3]
+    assert [row['overall'] for row in history] == [7.5, 8.0, 9.0]
+    assert history[0]['clarity'] == 8.0
+    assert history[1]['clarity'] is None
+
+
+def test_history_limit_returns_newest_oldest_first():
+    store = make_store()
+    for t in range(1, 6):
+        store.record('https://example.com', {'overall': str(t)}, recorded_at=t)
+
+    history = store.history('https://example.com', limit=2)
+    assert [row['recorded_at'] for row in history] == [4, 5]
+
+
+def test_leaderboard_skips_null_scores():
+    store = make_store()
+    store.record('https://a.com', {'overall': '5', 'trust': '9'}, recorded_at=1)
+    store.record('https://b.com', {'overall': '8'}, recorded_at=1)
+    store.record('https://c.com', {'overall': 'n/a', 'trust': '3'}, recorded_at=1)
+
+    assert [row['site'] for row in store.leaderboard('overall')] == ['b.com', 'a.com']
+    assert [row['site'] for row in store.leaderboard('trust', limit=1)] == ['a.com']
+
+
+def test_older_record_does_not_overwrite_latest():
+    store = make_store()
+    store.record('https://a.com', {'overall': '9'}, recorded_at=10)
+    store.record('https://a.com', {'overall': '2'}, recorded_at=5)
+
+    assert store.leaderboard('overall') == [{'site': 'a.com', 'recorded_at': 10, 'score': 9.0}]
+    assert len(store.history('https://a.com')) == 2
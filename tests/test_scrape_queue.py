@@ -0,0 +1,58 @@
+import threading
+
+from scrape_queue import PriorityExecutor, INTERACTIVE, BULK
+
+
+def test_interactive_jobs_run_before_queued_bulk_jobs():
+    executor = PriorityExecutor(max_workers=1, reserved_workers=0)
+    gate = threading.Event()
+    order = []
+
+    blocker = executor.submit(BULK, gate.wait)
+    bulk = [executor.submit(BULK, order.append, f'bulk{i}') for i in range(2)]
+    interactive = executor.submit(INTERACTIVE, order.append, 'interactive')
+    gate.set()
+
+    for future in [blocker, interactive] + bulk:
+        future.result(timeout=5)
+    assert order == ['interactive', 'bulk0', 'bulk1']
+
+
+def test_cancelled_queued_future_is_skipped():
+    executor = PriorityExecutor(max_workers=1, reserved_workers=0)
+    gate = threading.Event()
+    ran = []
+
+    blocker = executor.submit(BULK, gate.wait)
+    cancelled = executor.submit(BULK, ran.append, 'cancelled')
+    kept = executor.submit(BULK, ran.append, 'kept')
+    assert cancelled.cancel()
+    gate.set()
+
+    blocker.result(timeout=5)
+    kept.result(timeout=5)
+    assert cancelled.cancelled()
+    assert ran == ['kept']
+
+
+def test_reserved_worker_serves_interactive_while_bulk_is_saturated():
+    executor = PriorityExecutor(max_workers=2, reserved_workers=1)
+    gate = threading.Event()
+    bulk_started = threading.Event()
+    started = []
+
+    def bulk_job(name):
+        started.append(name)
+        bulk_started.set()
+        gate.wait(5)
+
+    bulk = [executor.submit(BULK, bulk_job, f'bulk{i}') for i in range(2)]
+    assert bulk_started.wait(5)
+    # Only one bulk job may hold a worker; the reserved one is free for this
+    executor.submit(INTERACTIVE, started.append, 'interactive').result(timeout=5)
+    assert started == ['bulk0', 'interactive']
+
+    gate.set()
+    for future in bulk:
+        future.result(timeout=5)
+    assert started == ['bulk0', 'interactive', 'bulk1']